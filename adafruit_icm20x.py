@@ -31,66 +31,121 @@ Implementation Notes
 __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_ICM20X.git"
 # Common imports; remove if unused or pylint will complain
+import struct
 from time import sleep
 
 from adafruit_bus_device import i2c_device
 from adafruit_register.i2c_bit import ROBit, RWBit
 from adafruit_register.i2c_bits import RWBits
-from adafruit_register.i2c_struct import ROUnaryStruct, Struct, UnaryStruct
+from adafruit_register.i2c_struct import ROUnaryStruct, UnaryStruct
+from micropython import const
 
-_ICM20649_DEFAULT_ADDRESS = 0x68  # icm20649 default i2c address
-_ICM20948_DEFAULT_ADDRESS = 0x69  # icm20649 default i2c address
-_ICM20649_DEVICE_ID = 0xE1  # Correct content of WHO_AM_I register
-_ICM20948_DEVICE_ID = 0xEA  # Correct content of WHO_AM_I register
+_ICM20649_DEFAULT_ADDRESS = const(0x68)  # icm20649 default i2c address
+_ICM20948_DEFAULT_ADDRESS = const(0x69)  # icm20649 default i2c address
+_ICM20649_DEVICE_ID = const(0xE1)  # Correct content of WHO_AM_I register
+_ICM20948_DEVICE_ID = const(0xEA)  # Correct content of WHO_AM_I register
 
 # Functions using these bank-specific registers are responsible for ensuring
 # that the correct bank is set
 # Bank 0
-_ICM20X_WHO_AM_I = 0x00  # device_id register
-_ICM20X_REG_BANK_SEL = 0x7F  # register bank selection register
-_ICM20X_PWR_MGMT_1 = 0x06  # primary power management register
-_ICM20X_ACCEL_XOUT_H = 0x2D  # first byte of accel data
-_ICM20X_GYRO_XOUT_H = 0x33  # first byte of accel data
-_ICM20X_I2C_MST_STATUS = 0x17  # I2C Microcontroller Status bits
-_ICM20948_EXT_SLV_SENS_DATA_00 = 0x3B
-
-_ICM20X_USER_CTRL = 0x03  # User Control Reg. Includes I2C Microcontroller
-_ICM20X_LP_CONFIG = 0x05  # Low Power config
-_ICM20X_REG_INT_PIN_CFG = 0xF  # Interrupt config register
-_ICM20X_REG_INT_ENABLE_0 = 0x10  # Interrupt enable register 0
-_ICM20X_REG_INT_ENABLE_1 = 0x11  # Interrupt enable register 1
-
-_ICM20X_REG_INT_STATUS_0 = 0x19  # Interrupt status register 0   Wake on motion, DMP int, i2c int
-_ICM20X_REG_INT_STATUS_1 = 0x1A  # Interrupt status register 1   data register from all sensors
-_ICM20X_REG_INT_STATUS_2 = 0x1B  # Interrupt status register 2   FIFO overflow
-_ICM20X_REG_INT_STATUS_3 = 0x1C  # Interrupt status register 3   Watermark interrupt
+_ICM20X_WHO_AM_I = const(0x00)  # device_id register
+_ICM20X_REG_BANK_SEL = const(0x7F)  # register bank selection register
+_ICM20X_PWR_MGMT_1 = const(0x06)  # primary power management register
+_ICM20X_ACCEL_XOUT_H = const(0x2D)  # first byte of accel data
+_ICM20X_GYRO_XOUT_H = const(0x33)  # first byte of accel data
+_ICM20X_TEMP_OUT_H = const(0x39)  # first byte of temperature data
+_ICM20X_I2C_MST_STATUS = const(0x17)  # I2C Microcontroller Status bits
+_ICM20948_EXT_SLV_SENS_DATA_00 = const(0x3B)
+
+_ICM20X_USER_CTRL = const(0x03)  # User Control Reg. Includes I2C Microcontroller
+_ICM20X_LP_CONFIG = const(0x05)  # Low Power config
+_ICM20X_REG_INT_PIN_CFG = const(0xF)  # Interrupt config register
+_ICM20X_REG_INT_ENABLE_0 = const(0x10)  # Interrupt enable register 0
+_ICM20X_REG_INT_ENABLE_1 = const(0x11)  # Interrupt enable register 1
+
+# Interrupt status registers
+_ICM20X_REG_INT_STATUS_0 = const(0x19)  # Wake on motion, DMP int, i2c int
+_ICM20X_REG_INT_STATUS_1 = const(0x1A)  # data register from all sensors
+_ICM20X_REG_INT_STATUS_2 = const(0x1B)  # FIFO overflow
+_ICM20X_REG_INT_STATUS_3 = const(0x1C)  # Watermark interrupt
+
+_ICM20X_FIFO_EN_2 = const(0x67)  # Selects the sensor data written to the FIFO
+_ICM20X_FIFO_RST = const(0x68)  # FIFO reset register
+_ICM20X_FIFO_COUNTH = const(0x70)  # first byte of the FIFO byte count
+_ICM20X_FIFO_R_W = const(0x72)  # FIFO data register
 
 # Bank 2
-_ICM20X_GYRO_SMPLRT_DIV = 0x00
-_ICM20X_GYRO_CONFIG_1 = 0x01
-_ICM20X_ACCEL_SMPLRT_DIV_1 = 0x10
-_ICM20X_ACCEL_SMPLRT_DIV_2 = 0x11
-_ICM20X_ACCEL_CONFIG_1 = 0x14
+_ICM20X_GYRO_SMPLRT_DIV = const(0x00)
+_ICM20X_GYRO_CONFIG_1 = const(0x01)
+_ICM20X_ODR_ALIGN_EN = const(0x09)  # Aligns the accel and gyro output data rates
+_ICM20X_ACCEL_SMPLRT_DIV_1 = const(0x10)
+_ICM20X_ACCEL_SMPLRT_DIV_2 = const(0x11)
+_ICM20X_ACCEL_CONFIG_1 = const(0x14)
 
 
 # Bank 3
 
-_ICM20X_I2C_MST_ODR_CONFIG = 0x0  # Sets ODR for I2C microcontroller bus
-_ICM20X_I2C_MST_CTRL = 0x1  # I2C microcontroller bus config
-_ICM20X_I2C_MST_DELAY_CTRL = 0x2  # I2C microcontroller bus config
-_ICM20X_I2C_SLV0_ADDR = 0x3  # Sets I2C address for I2C microcontroller bus sensor 0
-_ICM20X_I2C_SLV0_REG = 0x4  # Sets register address for I2C microcontroller bus sensor 0
-_ICM20X_I2C_SLV0_CTRL = 0x5  # Controls for I2C microcontroller bus sensor 0
-_ICM20X_I2C_SLV0_DO = 0x6  # Sets I2C microcontroller bus sensor 0 data out
+_ICM20X_I2C_MST_ODR_CONFIG = const(0x0)  # Sets ODR for I2C microcontroller bus
+_ICM20X_I2C_MST_CTRL = const(0x1)  # I2C microcontroller bus config
+_ICM20X_I2C_MST_DELAY_CTRL = const(0x2)  # I2C microcontroller bus config
+_ICM20X_I2C_SLV0_ADDR = const(0x3)  # Sets I2C address for I2C microcontroller bus sensor 0
+_ICM20X_I2C_SLV0_REG = const(0x4)  # Sets register address for I2C microcontroller bus sensor 0
+_ICM20X_I2C_SLV0_CTRL = const(0x5)  # Controls for I2C microcontroller bus sensor 0
+_ICM20X_I2C_SLV0_DO = const(0x6)  # Sets I2C microcontroller bus sensor 0 data out
 
-_ICM20X_I2C_SLV4_ADDR = 0x13  # Sets I2C address for I2C microcontroller bus sensor 4
-_ICM20X_I2C_SLV4_REG = 0x14  # Sets register address for I2C microcontroller bus sensor 4
-_ICM20X_I2C_SLV4_CTRL = 0x15  # Controls for I2C microcontroller bus sensor 4
-_ICM20X_I2C_SLV4_DO = 0x16  # Sets I2C microcontroller bus sensor 4 data out
-_ICM20X_I2C_SLV4_DI = 0x17  # Sets I2C microcontroller bus sensor 4 data in
+_ICM20X_I2C_SLV4_ADDR = const(0x13)  # Sets I2C address for I2C microcontroller bus sensor 4
+_ICM20X_I2C_SLV4_REG = const(0x14)  # Sets register address for I2C microcontroller bus sensor 4
+_ICM20X_I2C_SLV4_CTRL = const(0x15)  # Controls for I2C microcontroller bus sensor 4
+_ICM20X_I2C_SLV4_DO = const(0x16)  # Sets I2C microcontroller bus sensor 4 data out
+_ICM20X_I2C_SLV4_DI = const(0x17)  # Sets I2C microcontroller bus sensor 4 data in
 
 _ICM20X_UT_PER_LSB = 0.15  # mag data LSB value (fixed)
 _ICM20X_RAD_PER_DEG = 0.017453293  # Degrees/s to rad/s multiplier
+_ICM20X_DEG_C_PER_LSB = 1 / 333.87  # temperature sensitivity
+_ICM20X_TEMP_OFFSET_DEG_C = 21.0  # temperature at a raw reading of 0
+
+_ICM20X_DATA_FORMAT = ">hhhhhhh"  # accel x, y, z, gyro x, y, z, temperature
+_ICM20X_DATA_LEN = const(14)
+_ICM20948_MAG_FORMAT = "<hhhh"  # mag data is LE
+
+try:
+    # parse the formats once up front where struct.Struct is available
+    _unpack_data = struct.Struct(_ICM20X_DATA_FORMAT).unpack_from
+    _unpack_mag = struct.Struct(_ICM20948_MAG_FORMAT).unpack_from
+except AttributeError:
+    # CircuitPython's struct module has no Struct class
+
+    def _unpack_data(buf):
+        return struct.unpack_from(_ICM20X_DATA_FORMAT, buf)
+
+    def _unpack_mag(buf):
+        return struct.unpack_from(_ICM20948_MAG_FORMAT, buf)
+
+
+try:
+    from time import monotonic_ns as _ticks
+
+    _TICKS_PER_SECOND = 1000000000
+
+    def _ticks_diff(new, old):
+        return new - old
+
+except ImportError:
+    # Builds without long integer support have no monotonic_ns, and their float monotonic()
+    # loses precision after a few hours, so use the integer millisecond counter instead
+    try:
+        from supervisor import ticks_ms as _ticks
+
+        _TICKS_PER_SECOND = 1000
+
+        def _ticks_diff(new, old):
+            # ticks_ms wraps around at 2**29
+            return (new - old) & 0x1FFFFFFF
+
+    except ImportError:
+        # no suitable clock, so burst reads are never re-used
+        _ticks = None
+        _TICKS_PER_SECOND = 1
 
 G_TO_ACCEL = 9.80665
 
@@ -151,18 +206,17 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
 
     # Bank 0
     _device_id = ROUnaryStruct(_ICM20X_WHO_AM_I, ">B")
-    _bank_reg = UnaryStruct(_ICM20X_REG_BANK_SEL, ">B")
     _reset = RWBit(_ICM20X_PWR_MGMT_1, 7)
     _sleep_reg = RWBit(_ICM20X_PWR_MGMT_1, 6)
     _low_power_en = RWBit(_ICM20X_PWR_MGMT_1, 5)
+    _temp_dis = RWBit(_ICM20X_PWR_MGMT_1, 3)
     _clock_source = RWBits(3, _ICM20X_PWR_MGMT_1, 0)
 
-    _raw_accel_data = Struct(_ICM20X_ACCEL_XOUT_H, ">hhh")  # ds says LE :|
-    _raw_gyro_data = Struct(_ICM20X_GYRO_XOUT_H, ">hhh")
-
     _lp_config_reg = UnaryStruct(_ICM20X_LP_CONFIG, ">B")
 
-    _data_ready = ROBit(_ICM20X_REG_INT_STATUS_1, 0)
+    _fifo_enable = RWBit(_ICM20X_USER_CTRL, 6)
+    _fifo_en_2 = UnaryStruct(_ICM20X_FIFO_EN_2, ">B")
+    _fifo_reset = UnaryStruct(_ICM20X_FIFO_RST, ">B")
 
     _i2c_master_cycle_en = RWBit(_ICM20X_LP_CONFIG, 6)
     _accel_cycle_en = RWBit(_ICM20X_LP_CONFIG, 5)
@@ -177,6 +231,8 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
     _accel_range = RWBits(2, _ICM20X_ACCEL_CONFIG_1, 1)
     _accel_dlpf_config = RWBits(3, _ICM20X_ACCEL_CONFIG_1, 3)
 
+    _odr_align_enable = RWBit(_ICM20X_ODR_ALIGN_EN, 0)
+
     # this value is a 12-bit register spread across two bytes, big-endian first
     _accel_rate_divisor = UnaryStruct(_ICM20X_ACCEL_SMPLRT_DIV_1, ">H")
     _gyro_rate_divisor = UnaryStruct(_ICM20X_GYRO_SMPLRT_DIV, ">B")
@@ -218,16 +274,30 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
 
     @property
     def _bank(self):
-        return self._bank_reg >> 4
+        return self._read_register(_ICM20X_REG_BANK_SEL) >> 4
 
     @_bank.setter
     def _bank(self, value):
-        self._bank_reg = value << 4
+        # skip the bus write if the bank is already selected
+        if value == self._current_bank:
+            return
+        self._write_register(_ICM20X_REG_BANK_SEL, value << 4)
+        self._current_bank = value
 
     def __init__(self, i2c_bus, address):
         self.i2c_device = i2c_device.I2CDevice(i2c_bus, address)
+        # persistent buffers for register access so the data path doesn't allocate
+        self._out_buf = bytearray(1)
+        self._in_buf = bytearray(_ICM20X_DATA_LEN)
+        self._write_buf = bytearray(2)
+        self._fifo_buf = None  # allocated by the first call to read_fifo
+        self._raw_data = None
+        self._raw_data_time = None
+        self._temp_enabled = True
+        self._current_bank = None
         self._bank = 0
-        if not self._device_id in [_ICM20649_DEVICE_ID, _ICM20948_DEVICE_ID]:
+        device_id = self._device_id
+        if device_id not in (_ICM20649_DEVICE_ID, _ICM20948_DEVICE_ID):
             raise RuntimeError("Failed to find an ICM20X sensor - check your wiring!")
         self.reset()
         self.initialize()
@@ -236,28 +306,165 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
         """Configure the sensors with the default settings. For use after calling :meth:`reset`"""
 
         self._sleep = False
-        self.accelerometer_range = AccelRange.RANGE_8G  # pylint: disable=no-member
-        self.gyro_range = GyroRange.RANGE_500_DPS  # pylint: disable=no-member
+        self._temp_dis = not self._temp_enabled
+        self._gravity = G_TO_ACCEL
+        accel_range = AccelRange.RANGE_8G  # pylint: disable=no-member
+        gyro_range = GyroRange.RANGE_500_DPS  # pylint: disable=no-member
+        accel_rate_divisor = 20  # ~53.57Hz
+        gyro_rate_divisor = 10  # ~100Hz
+
+        # The bank 2 config registers are contiguous, so write them in two bursts rather than
+        # one transaction per setting. The DLPF enable bits keep their reset value of 1 and
+        # ACCEL_INTEL_CTRL and ACCEL_WOM_THR (0x12-0x13) are written with their reset value of 0
+        self._bank = 2
+        self._burst_write(
+            _ICM20X_GYRO_SMPLRT_DIV,
+            bytes((gyro_rate_divisor, gyro_range << 1 | 0x01)),
+        )
+        self._burst_write(
+            _ICM20X_ACCEL_SMPLRT_DIV_1,
+            bytes(
+                (accel_rate_divisor >> 8, accel_rate_divisor & 0xFF, 0, 0, accel_range << 1 | 0x01)
+            ),
+        )
+        self._bank = 0
 
-        self.accelerometer_data_rate_divisor = 20  # ~53.57Hz
-        self.gyro_data_rate_divisor = 10  # ~100Hz
+        self._cached_accel_range = accel_range
+        self._accel_scale = self._gravity / AccelRange.lsb[accel_range]
+        self._cached_gyro_range = gyro_range
+        self._gyro_scale = _ICM20X_RAD_PER_DEG / GyroRange.lsb[gyro_range]
+        self._cached_accel_rate_divisor = accel_rate_divisor
+        self._cached_gyro_rate_divisor = gyro_rate_divisor
+        self._cached_accel_dlpf_enabled = True
+        self._cached_gyro_dlpf_enabled = True
+        self._update_raw_data_max_age()
+        self._raw_data_time = None
+
+        self._configure_fifo(False)
+        sleep(0.100)  # needed to let new range settle
 
-        self._gravity = G_TO_ACCEL
+    def _reset_fifo(self):
+        self._bank = 0
+        self._fifo_reset = 0x1F
+        self._fifo_reset = 0x00
+
+    @property
+    def fifo_enabled(self):
+        """Streams accel, gyro and temperature samples into the FIFO for :meth:`read_fifo`.
+        Disabled by default.
+
+        Enabling the FIFO sets :attr:`accelerometer_data_rate_divisor` to the closest match for
+        the current :attr:`gyro_data_rate`, aligns the two output data rates and resets the FIFO,
+        so set :attr:`gyro_data_rate` first. Disabling it restores the accelerometer rate divisor
+        and rate alignment that were in place when it was enabled.
+
+        .. note::
+            The accelerometer and gyro rates are derived from different base rates (1125Hz and
+            1100Hz) and are only exactly equal when :attr:`gyro_data_rate_divisor` is one less
+            than a multiple of 44, such as 43 for 25Hz. Each FIFO packet holds the latest
+            register values of every sensor, so at other rates an accelerometer reading is
+            occasionally repeated in, or missing from, consecutive packets.
+        """
+        return self._fifo_enabled
+
+    @fifo_enabled.setter
+    def fifo_enabled(self, enabled):
+        if enabled == self._fifo_enabled:
+            return
+        if enabled:
+            # remember the settings changed here so that disabling the FIFO can put them back
+            self._saved_accel_rate_divisor = self.accelerometer_data_rate_divisor
+            self._bank = 2
+            self._saved_odr_align_enable = self._odr_align_enable
+            gyro_rate_divisor = self.gyro_data_rate_divisor
+            self.accelerometer_data_rate_divisor = round(1125 * (1 + gyro_rate_divisor) / 1100) - 1
+            self._bank = 2
+            self._odr_align_enable = True
+        else:
+            self.accelerometer_data_rate_divisor = self._saved_accel_rate_divisor
+            self._bank = 2
+            self._odr_align_enable = self._saved_odr_align_enable
+        self._configure_fifo(enabled)
+
+    def _configure_fifo(self, enabled):
+        self._bank = 0
+        # write accel, gyro and, unless it is disabled, temperature samples to the FIFO in data
+        # register order
+        if not enabled:
+            self._fifo_en_2 = 0x00
+        elif self._temp_enabled:
+            self._fifo_en_2 = 0x1F
+        else:
+            self._fifo_en_2 = 0x1E
+        self._fifo_enable = enabled
+        self._fifo_enabled = enabled
+        if enabled:
+            self._reset_fifo()
+
+    def read_fifo(self, max_packets):
+        """Reads up to ``max_packets`` samples from the FIFO in a single bus transaction.
+        :attr:`fifo_enabled` must be set first.
+
+        Each sample is 14 bytes laid out as accel x, y, z, gyro x, y, z and temperature,
+        big-endian, and can be converted with :meth:`decode_batch`. The temperature is left out,
+        giving 12-byte samples, while :attr:`temperature_enabled` is `False`. See
+        :attr:`fifo_enabled` for how the accelerometer and gyro rates line up within a sample.
+
+        The FIFO has to be read before it fills up. If it has overflowed it is reset and no
+        samples are returned, since the oldest samples may have been partially overwritten.
+
+        :param int max_packets: The maximum number of samples to read
+        :return: A `memoryview` of the raw samples. It is only valid until the next call
+        """
+        if not self._fifo_enabled:
+            raise RuntimeError("The FIFO is not enabled")
+        self._bank = 0
+        if self._read_register(_ICM20X_REG_INT_STATUS_2) & 0x1F:
+            self._reset_fifo()
+            return memoryview(b"")
+        self._burst_read(_ICM20X_FIFO_COUNTH, 2)
+        count = (self._in_buf[0] << 8 | self._in_buf[1]) & 0x1FFF
+        packet_len = _ICM20X_DATA_LEN if self._temp_enabled else _ICM20X_DATA_LEN - 2
+        length = min(count // packet_len, max_packets) * packet_len
+
+        if self._fifo_buf is None or len(self._fifo_buf) < length:
+            self._fifo_buf = bytearray(max_packets * packet_len)
+        if length:
+            self._out_buf[0] = _ICM20X_FIFO_R_W
+            with self.i2c_device as i2c:
+                i2c.write_then_readinto(self._out_buf, self._fifo_buf, in_end=length)
+        return memoryview(self._fifo_buf)[:length]
+
+    def _burst_write(self, register, payload):
+        """Writes ``payload`` to consecutive registers starting at ``register`` in one
+        transaction"""
+        with self.i2c_device as i2c:
+            i2c.write(bytes((register,)) + payload)
 
     def reset(self):
         """Resets the internal registers and restores the default settings"""
         self._bank = 0
 
-        sleep(0.005)
         self._reset = True
         sleep(0.005)
-        while self._reset:
-            sleep(0.005)
+        # register access can take up to 100ms to come back after a reset
+        for _i in range(100):
+            sleep(0.001)
+            if not self._reset:
+                break
+        else:
+            raise RuntimeError("Timed out waiting for the ICM20X to reset")
+        # the bank select register is cleared by the reset
+        self._current_bank = None
 
     def data_ready(self):
         """Checks if new data is available"""
         self._bank = 0
-        return self._data_ready
+        if self._read_register(_ICM20X_REG_INT_STATUS_1) & 0x01:
+            # the flag clears on read, so make sure the next property read fetches the new sample
+            self._raw_data_time = None
+            return True
+        return False
 
     @property
     def _sleep(self):
@@ -273,35 +480,187 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
         self._sleep_reg = sleep_enabled
         sleep(0.005)
 
+    def _read_register(self, register):
+        """Reads the single byte value of ``register``"""
+        self._burst_read(register, 1)
+        return self._in_buf[0]
+
+    def _write_register(self, register, value):
+        """Writes the single byte ``value`` to ``register``"""
+        self._write_buf[0] = register
+        self._write_buf[1] = value
+        with self.i2c_device as i2c:
+            i2c.write(self._write_buf)
+
+    def _burst_read(self, register, length):
+        """Reads ``length`` bytes starting at ``register`` into ``_in_buf`` in one transaction"""
+        self._out_buf[0] = register
+        with self.i2c_device as i2c:
+            i2c.write_then_readinto(self._out_buf, self._in_buf, in_end=length)
+
+    def _update_raw_data_max_age(self):
+        # With a DLPF disabled the sensor outputs at several kHz regardless of the rate
+        # divisors, too fast to re-use a burst read at all
+        if not (self._cached_accel_dlpf_enabled and self._cached_gyro_dlpf_enabled):
+            self._raw_data_max_age = -1
+            return
+        # Only re-use a burst read for half of the fastest sample period, so that
+        # back-to-back property reads share a transfer without hiding a newer sample
+        fastest_rate = max(
+            self._accel_rate_calc(self._cached_accel_rate_divisor),
+            self._gyro_rate_calc(self._cached_gyro_rate_divisor),
+        )
+        # less one tick, since a coarse clock can under-report the elapsed time by up to a tick
+        self._raw_data_max_age = _TICKS_PER_SECOND / (2 * fastest_rate) - 1
+
+    def _read_raw_data(self):
+        """Returns the raw accel, gyro and temperature readings, re-using the last burst
+        read if it is recent enough"""
+        now = _ticks() if _ticks else None
+        if (
+            now is None
+            or self._raw_data_time is None
+            or _ticks_diff(now, self._raw_data_time) > self._raw_data_max_age
+        ):
+            self._bank = 0
+            # accel, gyro and temperature registers are contiguous; read them all at once,
+            # leaving off the trailing temperature bytes when the sensor is disabled
+            if self._temp_enabled:
+                self._burst_read(_ICM20X_ACCEL_XOUT_H, _ICM20X_DATA_LEN)
+            else:
+                self._burst_read(_ICM20X_ACCEL_XOUT_H, _ICM20X_DATA_LEN - 2)
+            self._raw_data = _unpack_data(self._in_buf)
+            self._raw_data_time = now
+        return self._raw_data
+
+    def read_all(self):
+        """Reads the temperature, acceleration and gyro data in a single bus transaction.
+
+        :return: A tuple of ``(temperature, (x, y, z) acceleration, (x, y, z) gyro)``, in the
+            same units as :attr:`temperature`, :attr:`acceleration` and :attr:`gyro`. The
+            temperature is `None` when :attr:`temperature_enabled` is `False`
+        """
+        self._raw_data_time = None
+        raw_data = self._read_raw_data()
+        accel_scale = self._accel_scale
+        gyro_scale = self._gyro_scale
+        temperature = None
+        if self._temp_enabled:
+            temperature = raw_data[6] * _ICM20X_DEG_C_PER_LSB + _ICM20X_TEMP_OFFSET_DEG_C
+        return (
+            temperature,
+            (raw_data[0] * accel_scale, raw_data[1] * accel_scale, raw_data[2] * accel_scale),
+            (raw_data[3] * gyro_scale, raw_data[4] * gyro_scale, raw_data[5] * gyro_scale),
+        )
+
     @property
-    def acceleration(self):
-        """The x, y, z acceleration values returned in a 3-tuple and are in :math:`m / s ^ 2.`"""
+    def temperature(self):
+        """The current temperature in :math:`degrees Celsius`"""
+        if not self._temp_enabled:
+            raise RuntimeError("The temperature sensor is disabled")
+        raw_data = self._read_raw_data()
+        return raw_data[6] * _ICM20X_DEG_C_PER_LSB + _ICM20X_TEMP_OFFSET_DEG_C
+
+    @property
+    def temperature_enabled(self):
+        """Enables or disables the temperature sensor. When disabled, :attr:`temperature` is
+        unavailable and the data reads skip the temperature registers"""
+        return self._temp_enabled
+
+    @temperature_enabled.setter
+    def temperature_enabled(self, enabled):
         self._bank = 0
-        raw_accel_data = self._raw_accel_data
+        self._temp_dis = not enabled
+        self._temp_enabled = enabled
+        self._raw_data_time = None
+        if self._fifo_enabled:
+            # the FIFO packet layout changes, so start over with the new one
+            self._fifo_en_2 = 0x1F if enabled else 0x1E
+            self._reset_fifo()
 
-        x = self._scale_xl_data(raw_accel_data[0])
-        y = self._scale_xl_data(raw_accel_data[1])
-        z = self._scale_xl_data(raw_accel_data[2])
+    @property
+    def acceleration(self):
+        """The x, y, z acceleration values returned in a 3-tuple and are in :math:`m / s ^ 2.`"""
+        raw_data = self._read_raw_data()
+        scale = self._accel_scale
 
-        return (x, y, z)
+        return (raw_data[0] * scale, raw_data[1] * scale, raw_data[2] * scale)
 
     @property
     def gyro(self):
         """The x, y, z angular velocity values returned in a 3-tuple and
         are in :math:`degrees / second`"""
-        self._bank = 0
-        raw_gyro_data = self._raw_gyro_data
-        x = self._scale_gyro_data(raw_gyro_data[0])
-        y = self._scale_gyro_data(raw_gyro_data[1])
-        z = self._scale_gyro_data(raw_gyro_data[2])
+        raw_data = self._read_raw_data()
+        scale = self._gyro_scale
 
-        return (x, y, z)
+        return (raw_data[3] * scale, raw_data[4] * scale, raw_data[5] * scale)
+
+    def decode_batch(self, buf, n, out):
+        """Converts ``n`` consecutive samples, laid out as they are returned by
+        :meth:`read_fifo`, into temperature, acceleration and gyro values. Samples are 14 bytes,
+        or 12 bytes without the temperature while :attr:`temperature_enabled` is `False`.
 
-    def _scale_xl_data(self, raw_measurement):
-        return raw_measurement / AccelRange.lsb[self._cached_accel_range] * self._gravity
+        Intended for host computers logging at high rates; requires numpy, which does the
+        byte swapping, sign extension and scaling for the whole batch at once.
+
+        :param bytes buf: The raw samples
+        :param int n: The number of samples in ``buf``
+        :param ~numpy.ndarray out: A ``float32`` array of shape ``(n, 7)`` that receives
+            temperature, accel x, y, z and gyro x, y, z for each sample, in that column order.
+            The temperature column is NaN while :attr:`temperature_enabled` is `False`
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        if not self._temp_enabled:
+            raw = np.frombuffer(buf, dtype=">i2", count=n * 6).reshape(n, 6)
+            scale = np.array((self._accel_scale,) * 3 + (self._gyro_scale,) * 3, dtype=np.float32)
+            np.multiply(raw, scale, out=out[:, 1:])
+            out[:, 0] = np.nan
+            return
+
+        raw = np.frombuffer(buf, dtype=">i2", count=n * 7).reshape(n, 7)
+        scale = np.array(
+            (_ICM20X_DEG_C_PER_LSB,) + (self._accel_scale,) * 3 + (self._gyro_scale,) * 3,
+            dtype=np.float32,
+        )
+        # move temperature from the last column to the first
+        np.multiply(raw[:, (6, 0, 1, 2, 3, 4, 5)], scale, out=out)
+        out[:, 0] += _ICM20X_TEMP_OFFSET_DEG_C
 
-    def _scale_gyro_data(self, raw_measurement):
-        return (raw_measurement / GyroRange.lsb[self._cached_gyro_range]) * _ICM20X_RAD_PER_DEG
+    def read_accel(self, out=None):
+        """Reads the x, y, z acceleration values in :math:`m / s ^ 2` into a list.
+
+        Unlike :attr:`acceleration`, a list passed as ``out`` is filled in place, so tight
+        loops can re-use it instead of allocating a new tuple for every sample.
+
+        :param list out: A list of at least three items to store the values in. A new list is
+            created if it is not given
+        :return: ``out``
+        """
+        if out is None:
+            out = [0.0, 0.0, 0.0]
+        raw_data = self._read_raw_data()
+        scale = self._accel_scale
+        out[0] = raw_data[0] * scale
+        out[1] = raw_data[1] * scale
+        out[2] = raw_data[2] * scale
+        return out
+
+    def read_gyro(self, out=None):
+        """Reads the x, y, z angular velocity values into a list. See :meth:`read_accel`.
+
+        :param list out: A list of at least three items to store the values in. A new list is
+            created if it is not given
+        :return: ``out``
+        """
+        if out is None:
+            out = [0.0, 0.0, 0.0]
+        raw_data = self._read_raw_data()
+        scale = self._gyro_scale
+        out[0] = raw_data[3] * scale
+        out[1] = raw_data[4] * scale
+        out[2] = raw_data[5] * scale
+        return out
 
     @property
     def accelerometer_range(self):
@@ -318,6 +677,9 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
         self._accel_range = value
         sleep(0.005)
         self._cached_accel_range = value
+        # multiplier from raw counts to m/s^2, refreshed whenever the range or gravity changes
+        self._accel_scale = self._gravity / AccelRange.lsb[value]
+        self._raw_data_time = None
         self._bank = 0
 
     @property
@@ -337,6 +699,9 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
         self._gyro_range = value
         sleep(0.005)
         self._cached_gyro_range = value
+        # multiplier from raw counts to rad/s, refreshed whenever the range changes
+        self._gyro_scale = _ICM20X_RAD_PER_DEG / GyroRange.lsb[value]
+        self._raw_data_time = None
         self._bank = 0
         sleep(0.100)  # needed to let new range settle
 
@@ -358,7 +723,6 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
         """
         self._bank = 2
         raw_rate_divisor = self._accel_rate_divisor
-        sleep(0.005)
         self._bank = 0
         # rate_hz = 1125/(1+raw_rate_divisor)
         return raw_rate_divisor
@@ -370,6 +734,8 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
         sleep(0.005)
         self._accel_rate_divisor = value
         sleep(0.005)
+        self._cached_accel_rate_divisor = value
+        self._update_raw_data_max_age()
 
     @property
     def gyro_data_rate_divisor(self):
@@ -389,7 +755,6 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
 
         self._bank = 2
         raw_rate_divisor = self._gyro_rate_divisor
-        sleep(0.005)
         self._bank = 0
         # rate_hz = 1100/(1+raw_rate_divisor)
         return raw_rate_divisor
@@ -401,6 +766,8 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
         sleep(0.005)
         self._gyro_rate_divisor = value
         sleep(0.005)
+        self._cached_gyro_rate_divisor = value
+        self._update_raw_data_max_age()
 
     def _accel_rate_calc(self, divisor):  # pylint:disable=no-self-use
         return 1125 / (1 + divisor)
@@ -479,9 +846,13 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
         # check for shutdown
         if cutoff_frequency is AccelDLPFFreq.DISABLED:  # pylint: disable=no-member
             self._accel_dlpf_enable = False
+            self._cached_accel_dlpf_enabled = False
+            self._update_raw_data_max_age()
             return
         self._accel_dlpf_enable = True
         self._accel_dlpf_config = cutoff_frequency
+        self._cached_accel_dlpf_enabled = True
+        self._update_raw_data_max_age()
 
     @property
     def gyro_dlpf_cutoff(self):
@@ -505,9 +876,13 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
         # check for shutdown
         if cutoff_frequency is GyroDLPFFreq.DISABLED:  # pylint: disable=no-member
             self._gyro_dlpf_enable = False
+            self._cached_gyro_dlpf_enabled = False
+            self._update_raw_data_max_age()
             return
         self._gyro_dlpf_enable = True
         self._gyro_dlpf_config = cutoff_frequency
+        self._cached_gyro_dlpf_enabled = True
+        self._update_raw_data_max_age()
 
     @property
     def _low_power(self):
@@ -527,6 +902,7 @@ class ICM20X:  # pylint:disable=too-many-instance-attributes
     @gravity.setter
     def gravity(self, value):
         self._gravity = value
+        self._accel_scale = value / AccelRange.lsb[self._cached_accel_range]
 
 
 class ICM20649(ICM20X):
@@ -584,18 +960,18 @@ class ICM20649(ICM20X):
 
 
 # https://www.y-ic.es/datasheet/78/SMDSW.020-2OZ.pdf page 19
-_AK09916_WIA1 = 0x00
-_AK09916_WIA2 = 0x01
-_AK09916_ST1 = 0x10
-_AK09916_HXL = 0x11
-_AK09916_HXH = 0x12
-_AK09916_HYL = 0x13
-_AK09916_HYH = 0x14
-_AK09916_HZL = 0x15
-_AK09916_HZH = 0x16
-_AK09916_ST2 = 0x18
-_AK09916_CNTL2 = 0x31
-_AK09916_CNTL3 = 0x32
+_AK09916_WIA1 = const(0x00)
+_AK09916_WIA2 = const(0x01)
+_AK09916_ST1 = const(0x10)
+_AK09916_HXL = const(0x11)
+_AK09916_HXH = const(0x12)
+_AK09916_HYL = const(0x13)
+_AK09916_HYH = const(0x14)
+_AK09916_HZL = const(0x15)
+_AK09916_HZH = const(0x16)
+_AK09916_ST2 = const(0x18)
+_AK09916_CNTL2 = const(0x31)
+_AK09916_CNTL3 = const(0x32)
 
 
 class MagDataRate(CV):
@@ -642,9 +1018,6 @@ class ICM20948(ICM20X):  # pylint:disable=too-many-instance-attributes
 
     _slave_finished = ROBit(_ICM20X_I2C_MST_STATUS, 6)
 
-    # mag data is LE
-    _raw_mag_data = Struct(_ICM20948_EXT_SLV_SENS_DATA_00, "<hhhh")
-
     _bypass_i2c_master = RWBit(_ICM20X_REG_INT_PIN_CFG, 1)
     _i2c_master_control = UnaryStruct(_ICM20X_I2C_MST_CTRL, ">B")
     _i2c_master_enable = RWBit(_ICM20X_USER_CTRL, 5)  # TODO: use this in sw reset
@@ -760,7 +1133,8 @@ class ICM20948(ICM20X):  # pylint:disable=too-many-instance-attributes
         """The current magnetic field strengths on the X, Y, and Z axes in uT (micro-teslas)"""
 
         self._bank = 0
-        full_data = self._raw_mag_data
+        self._burst_read(_ICM20948_EXT_SLV_SENS_DATA_00, 8)
+        full_data = _unpack_mag(self._in_buf)
 
         x = full_data[0] * _ICM20X_UT_PER_LSB
         y = full_data[1] * _ICM20X_UT_PER_LSB
@@ -815,7 +1189,6 @@ class ICM20948(ICM20X):  # pylint:disable=too-many-instance-attributes
 
         self._bank = 3
         mag_register_data = self._slave4_di
-        sleep(0.005)
         return mag_register_data
 
     def _write_mag_register(self, register_addr, value, slave_addr=0x0C):